@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def get_monthly_means_for_stations(df: pd.DataFrame) -> pd.DataFrame:
@@ -86,6 +87,7 @@ def get_who_norm_exceeding_days(df: pd.DataFrame) -> pd.DataFrame:
         DataFrame z liczbą dni w miesiącu przekraczających normę WHO dla każdej stacji.
     """
     # Ustawiamy indeks czasowy i resamplujemy dane do częstotliwości dziennej ('D')
+    df = df.copy()  # nie modyfikujemy ramki wejściowej (może być współdzielona)
     df[('Data', '')] = pd.to_datetime(df[('Data', '')], format="mixed")
     # Ustawiamy datę jako indeks
     df_daily = df.set_index(('Data', ''))
@@ -104,13 +106,100 @@ def get_max_and_min_k_stations(yearly_counts: pd.DataFrame, chosen_year: int, k:
         chosen_year: rok do analizy.
         k: liczba stacji do zwrócenia z najwyższymi i najniższymi wartościami.
     Returns:
-        DataFrame z 2k stacjami (k najwyższych i k najniższych).
+        DataFrame z 2k stacjami (k najwyższych i k najniższych), posortowany rosnąco.
+        Wynik odpowiada początkowi i końcowi stabilnego sortowania rosnącego.
     """
     if chosen_year not in yearly_counts.columns:
         return pd.DataFrame()
-        
-    sorted_results = yearly_counts.sort_values(by=chosen_year)
-    return pd.concat([sorted_results.head(k), sorted_results.tail(k)])
+
+    # Wybieramy k skrajnych stacji bez sortowania całej tabeli (remisy wg kolejności stacji)
+    values = yearly_counts[chosen_year].to_numpy()
+    lowest = _top_k_positions(values, k, largest=False)
+    highest = _top_k_positions(values, k, largest=True)[::-1]
+    return yearly_counts.iloc[np.concatenate([lowest, highest])]
+
+def _top_k_positions(values: np.ndarray, k: int, largest: bool=True) -> np.ndarray:
+    """Zwraca pozycje k największych (lub najmniejszych) wartości, od najbardziej skrajnej.
+    Pozycje porządkowane są tak jak w stabilnym sortowaniu rosnącym z brakami (NaN) na końcu:
+    k najmniejszych to jego początek, a k największych - jego koniec
+    (przy remisach wygrywa wcześniejsza pozycja dla minimum i późniejsza dla maksimum).
+    Arguments:
+        values: jednowymiarowa tablica wartości.
+        k: liczba pozycji do zwrócenia.
+        largest: czy wybierać największe (True), czy najmniejsze (False) wartości.
+    Returns:
+        Tablica z co najwyżej k pozycjami."""
+    values = np.asarray(values, dtype=float)
+    k = min(max(k, 0), len(values))
+    missing = np.isnan(values)
+    finite = np.flatnonzero(~missing)
+    nan_positions = np.flatnonzero(missing)
+
+    if largest:
+        # Braki są na końcu sortowania, więc to one są "największe"
+        top_nan = nan_positions[::-1][:k]
+        return np.concatenate([top_nan, finite[_select_k(values[finite], k - len(top_nan), True)]])
+    top_finite = finite[_select_k(values[finite], k, False)]
+    return np.concatenate([top_finite, nan_positions[:k - len(top_finite)]])
+
+def _select_k(values: np.ndarray, k: int, largest: bool) -> np.ndarray:
+    """Wybiera pozycje k skrajnych wartości (bez NaN) według pary (wartość, pozycja)."""
+    k = min(max(k, 0), len(values))
+    if k == 0:
+        return np.array([], dtype=np.intp)
+
+    # partition znajduje k-tą wartość w czasie liniowym;
+    # sortujemy tylko kandydatów nie gorszych od niej (razem z remisami)
+    keys = -values if largest else values
+    kth = np.partition(keys, k - 1)[k - 1]
+    candidates = np.flatnonzero(keys <= kth)
+    tie_break = -candidates if largest else candidates
+    order = np.lexsort((tie_break, keys[candidates]))
+    return candidates[order[:k]]
+
+def get_station_rankings(df: pd.DataFrame, code_to_voivodeship: dict=None, thresholds: list=None, k: int=3) -> pd.DataFrame:
+    """Zwraca k stacji z największą i najmniejszą liczbą dni z przekroczeniem normy
+    dla wszystkich lat, norm i województw jednocześnie.
+    Dane przetwarzane są rok po roku, więc w pamięci trzymane są tylko średnie dzienne
+    z jednego roku oraz k najlepszych i najgorszych stacji dla każdej grupy.
+    Arguments:
+        df: DataFrame z danymi PM2.5, gdzie kolumny to (miejscowość, kod stacji).
+        code_to_voivodeship: słownik mapujący kody stacji na województwa;
+            jeśli podany, rankingi tworzone są także osobno dla każdego województwa.
+        thresholds: lista progów stężenia PM2.5 (µg/m³); domyślnie [15].
+        k: liczba stacji w każdym rankingu.
+    Returns:
+        DataFrame w formacie długim z kolumnami: Norma, Rok, Województwo, Ranking ('max'/'min'),
+        Pozycja, Miejscowość, Kod stacji, Liczba dni. Ranking dla wszystkich stacji ma
+        województwo 'Polska'."""
+    thresholds = thresholds or [15]
+    station_cols = [col for col in df.columns if col != ('Data', '')]
+    dates = pd.to_datetime(df[('Data', '')], format="mixed")
+
+    regions = [('Polska', np.arange(len(station_cols)))]
+    if code_to_voivodeship:
+        voivodeships = np.array([code_to_voivodeship.get(col[1], 'Nieznane') for col in station_cols])
+        regions += [(v, np.flatnonzero(voivodeships == v)) for v in sorted(set(voivodeships))]
+
+    rows = []
+    for year, positions in sorted(dates.groupby(dates.dt.year).indices.items()):
+        # Średnie dzienne tylko dla jednego roku
+        df_year = df.iloc[positions][station_cols].apply(pd.to_numeric, errors='coerce')
+        df_year.index = dates.iloc[positions]
+        daily_means = df_year.resample('D').mean().to_numpy()
+
+        for threshold in thresholds:
+            counts = (daily_means > threshold).sum(axis=0)
+            for region, members in regions:
+                for ranking, largest in (('max', True), ('min', False)):
+                    top = members[_top_k_positions(counts[members], k, largest)]
+                    for rank, i in enumerate(top, start=1):
+                        city, code = station_cols[i]
+                        rows.append((threshold, int(year), region, ranking, rank, city, code, int(counts[i])))
+
+    return pd.DataFrame(rows, columns=[
+        'Norma', 'Rok', 'Województwo', 'Ranking', 'Pozycja', 'Miejscowość', 'Kod stacji', 'Liczba dni'
+    ])
 
 def get_voivodeship_exceeding_days(df: pd.DataFrame, code_to_voivodeship: dict, threshold: float=15) -> pd.DataFrame:
     """Zwraca liczbę dni w roku, w których średnie dzienne PM2.5 przekroczyły próg
@@ -0,0 +1,212 @@
+import time
+import numpy as np
+import pandas as pd
+import requests
+
+
+GIOS_API_URL = "https://api.gios.gov.pl/pjp-api/v1/rest/data/getData/"
+
+
+def fetch_latest_measurements(sensor_id, base_url: str=GIOS_API_URL) -> pd.Series:
+    """Pobiera najnowsze godzinowe pomiary dla stanowiska pomiarowego z API GIOŚ.
+    Arguments:
+        sensor_id: ID stanowiska pomiarowego PM2.5 w serwisie GIOŚ.
+        base_url: adres usługi zwracającej dane pomiarowe.
+    Returns:
+        Series z wartościami PM2.5, gdzie indeks to daty pomiarów."""
+    response = requests.get(f"{base_url}{sensor_id}", timeout=30)
+    response.raise_for_status()  # jeśli błąd HTTP, zatrzymaj
+
+    records = response.json().get('Lista danych pomiarowych', [])
+    dates = pd.to_datetime([record['Data'] for record in records])
+    values = pd.to_numeric(
+        pd.Series([record['Wartość'] for record in records], index=dates, dtype=object),
+        errors='coerce'
+    )
+    return values.dropna().sort_index()
+
+
+class RollingWindowStore:
+    """Przechowuje godzinowe pomiary PM2.5 z ostatnich `window_days` dni.
+
+    Dla każdej stacji pomiary trzymane są w buforze cyklicznym (tablica NumPy),
+    a sumy dzienne i dni z przekroczeniem normy aktualizowane są przyrostowo
+    przy każdym nowym pomiarze. Pomiary o północy przypisywane są do
+    poprzedniego dnia, tak jak w `change_midnight_measurements`."""
+
+    def __init__(self, stations: list, code_to_city: dict=None, window_days: int=90, threshold: float=15):
+        """Arguments:
+            stations: lista kodów stacji.
+            code_to_city: słownik mapujący kody stacji na nazwy miast.
+            window_days: liczba ostatnich dni przechowywanych w buforze.
+            threshold: próg stężenia PM2.5 (µg/m³) dla średniej dziennej."""
+        self.stations = list(stations)
+        self.code_to_city = code_to_city or {}
+        self.window_days = window_days
+        self.threshold = threshold
+        self._station_pos = {code: i for i, code in enumerate(self.stations)}
+
+        n = len(self.stations)
+        n_hours = window_days * 24
+        # Bufor godzinowy: numer godziny (od epoki) zajmującej slot oraz wartość
+        self._hour_keys = np.full((n, n_hours), -1, dtype=np.int64)
+        self._hour_values = np.full((n, n_hours), np.nan)
+        # Bufor dzienny: numer dnia (wspólny dla stacji), suma i liczba pomiarów oraz flaga przekroczenia
+        self._day_keys = np.full(window_days, -1, dtype=np.int64)
+        self._day_sums = np.zeros((n, window_days))
+        self._day_counts = np.zeros((n, window_days), dtype=np.int64)
+        self._day_exceeded = np.zeros((n, window_days), dtype=bool)
+        self._exceeding_days = np.zeros(n, dtype=np.int64)
+        self._latest_day = -1
+
+    def append(self, station, date, value: float) -> bool:
+        """Dodaje (lub nadpisuje) pomiar godzinowy dla stacji.
+        Arguments:
+            station: kod stacji.
+            date: data i godzina pomiaru.
+            value: stężenie PM2.5 (µg/m³).
+        Returns:
+            True, jeśli pomiar został zapisany, False, jeśli jest brakujący (NaN)
+            lub starszy niż okno."""
+        i = self._station_pos[station]
+        if pd.isna(value):
+            return False
+        date = pd.Timestamp(date)
+        hour = date.floor('h').value // 3_600_000_000_000
+        # Pomiar o północy należy do poprzedniego dnia
+        day = (hour - 1) // 24
+
+        if day <= self._latest_day - self.window_days:
+            return False
+        if day > self._latest_day:
+            self._advance(day)
+
+        d = day % self.window_days
+        h = hour % (self.window_days * 24)
+        if self._hour_keys[i, h] == hour:
+            # Ponowny pomiar tej samej godziny - zastępujemy poprzednią wartość
+            self._day_sums[i, d] -= self._hour_values[i, h]
+            self._day_counts[i, d] -= 1
+        self._hour_keys[i, h] = hour
+        self._hour_values[i, h] = value
+        self._day_sums[i, d] += value
+        self._day_counts[i, d] += 1
+
+        exceeded = self._day_sums[i, d] / self._day_counts[i, d] > self.threshold
+        self._exceeding_days[i] += int(exceeded) - int(self._day_exceeded[i, d])
+        self._day_exceeded[i, d] = exceeded
+        return True
+
+    def _advance(self, day: int):
+        """Przesuwa okno do dnia `day`, usuwając dni, które z niego wypadły."""
+        first_new = max(self._latest_day + 1, day - self.window_days + 1)
+        for new_day in range(first_new, day + 1):
+            d = new_day % self.window_days
+            # Korygujemy liczniki przekroczeń o dzień wypadający z okna
+            self._exceeding_days -= self._day_exceeded[:, d]
+            self._day_keys[d] = new_day
+            self._day_sums[:, d] = 0
+            self._day_counts[:, d] = 0
+            self._day_exceeded[:, d] = False
+        self._latest_day = day
+
+    def extend(self, station, measurements: pd.Series) -> int:
+        """Dodaje serię pomiarów godzinowych dla stacji.
+        Arguments:
+            station: kod stacji.
+            measurements: Series z wartościami PM2.5, gdzie indeks to daty.
+        Returns:
+            Liczba zapisanych pomiarów."""
+        return sum(self.append(station, date, value) for date, value in measurements.items())
+
+    def _columns(self) -> pd.MultiIndex:
+        return pd.MultiIndex.from_tuples(
+            [(self.code_to_city.get(code, 'Nieznane'), code) for code in self.stations],
+            names=['Miejscowość', 'Kod stacji']
+        )
+
+    def _valid_days(self) -> np.ndarray:
+        """Zwraca posortowane numery dni z okna, dla których są jakiekolwiek pomiary."""
+        has_data = (self._day_keys >= 0) & (self._day_counts.sum(axis=0) > 0)
+        return np.sort(self._day_keys[has_data])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Zwraca pomiary godzinowe z okna w formacie zgodnym z `read_data_from_csv`.
+        Returns:
+            DataFrame z kolumną ('Data', '') i kolumnami (miejscowość, kod stacji)."""
+        first_hour = (self._latest_day - self.window_days + 1) * 24 + 1
+        valid = (self._hour_keys >= 0) & (self._hour_keys >= first_hour)
+        hours = np.unique(self._hour_keys[valid])
+
+        values = np.full((len(hours), len(self.stations)), np.nan)
+        station_idx, slot_idx = np.nonzero(valid)
+        rows = np.searchsorted(hours, self._hour_keys[station_idx, slot_idx])
+        values[rows, station_idx] = self._hour_values[station_idx, slot_idx]
+
+        df = pd.DataFrame(values, columns=self._columns())
+        dates = pd.to_datetime(hours, unit='h')
+        # Zgodnie z `change_midnight_measurements` pomiar o północy to 23:59:59 dnia poprzedniego
+        midnight = dates.hour == 0
+        dates = dates.where(~midnight, dates - pd.Timedelta(seconds=1))
+        df.insert(0, ('Data', ''), dates)
+        return df
+
+    def get_daily_means(self) -> pd.DataFrame:
+        """Zwraca średnie dzienne PM2.5 dla dni z okna.
+        Returns:
+            DataFrame ze średnimi dziennymi, gdzie indeks to daty, a kolumny to stacje."""
+        days = self._valid_days()
+        slots = days % self.window_days
+        sums = self._day_sums[:, slots].T
+        counts = self._day_counts[:, slots].T
+        means = np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+        index = pd.to_datetime(days, unit='D').rename(('Data', ''))
+        return pd.DataFrame(means, index=index, columns=self._columns())
+
+    def get_who_norm_exceeding_days(self) -> pd.DataFrame:
+        """Zwraca liczbę dni z przekroczeniem progu w każdym roku z okna,
+        w formacie zgodnym z `get_who_norm_exceeding_days`.
+        Returns:
+            DataFrame z liczbą dni przekroczeń, gdzie wiersze to stacje, a kolumny to lata."""
+        days = self._valid_days()
+        exceeded = pd.DataFrame(
+            self._day_exceeded[:, days % self.window_days].T,
+            index=pd.to_datetime(days, unit='D'),
+            columns=self._columns()
+        )
+        yearly_counts = exceeded.groupby(exceeded.index.year).sum()
+        return yearly_counts.T  # stacje w wierszach, lata w kolumnach
+
+    def get_exceeding_days_in_window(self) -> pd.Series:
+        """Zwraca liczbę dni z przekroczeniem progu w całym oknie dla każdej stacji.
+        Returns:
+            Series z liczbą dni przekroczeń, gdzie indeks to stacje."""
+        return pd.Series(self._exceeding_days.copy(), index=self._columns())
+
+
+def poll_latest_measurements(store: RollingWindowStore, sensors: dict, base_url: str=GIOS_API_URL,
+                             interval: float=3600, iterations: int=None) -> RollingWindowStore:
+    """Cyklicznie pobiera najnowsze pomiary i dopisuje je do bufora.
+    Arguments:
+        store: bufor, do którego dopisywane są pomiary.
+        sensors: słownik mapujący kody stacji na ID stanowisk PM2.5 w serwisie GIOŚ.
+        base_url: adres usługi zwracającej dane pomiarowe.
+        interval: odstęp między kolejnymi odpytaniami (w sekundach).
+        iterations: liczba odpytań; None oznacza działanie bez końca.
+    Returns:
+        Zaktualizowany bufor."""
+    iteration = 0
+    while iterations is None or iteration < iterations:
+        for station, sensor_id in sensors.items():
+            try:
+                measurements = fetch_latest_measurements(sensor_id, base_url)
+            except requests.RequestException as e:
+                print(f"Błąd przy pobieraniu danych dla {station}: {e}")
+                continue
+            store.extend(station, measurements)
+
+        iteration += 1
+        if iterations is None or iteration < iterations:
+            time.sleep(interval)
+    return store
@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+import numpy as np
+import pandas as pd
+from scripts.shared_data import SharedDataset
+
+
+BACKENDS = ('serial', 'thread', 'process')
+
+
+def split_station_columns(df: pd.DataFrame, n_chunks: int) -> list[list]:
+    """Dzieli kolumny stacji na `n_chunks` możliwie równych, ciągłych części.
+    Arguments:
+        df: DataFrame z danymi PM2.5, gdzie kolumny to (miejscowość, kod stacji).
+        n_chunks: liczba części.
+    Returns:
+        Lista list kolumn stacji (bez kolumny ('Data', ''))."""
+    station_cols = [col for col in df.columns if col != ('Data', '')]
+    n_chunks = max(1, min(n_chunks, len(station_cols)))
+    return [
+        [station_cols[i] for i in chunk]
+        for chunk in np.array_split(np.arange(len(station_cols)), n_chunks)
+    ]
+
+def _merge_axis(result: pd.DataFrame, chunk_cols: list) -> int:
+    """Ustala, czy stacje są w kolumnach (1), czy w wierszach (0) wyniku."""
+    return 1 if all(col in result.columns for col in chunk_cols) else 0
+
+def _run_on_shared_chunk(func, name: str, start: int, stop: int) -> pd.DataFrame:
+    """Uruchamia funkcję w procesie roboczym na widoku części stacji ze zbioru współdzielonego."""
+    dataset = SharedDataset.attach(name)
+    frame = dataset.to_frame(start, stop)
+    try:
+        # Kopiujemy wynik, żeby nie zależał od pamięci współdzielonej po jej zamknięciu
+        return func(frame).copy()
+    finally:
+        del frame
+        dataset.close()
+
+def _run_in_processes(func, df, chunks: list, n_workers: int) -> list:
+    """Uruchamia funkcję w puli procesów, które czytają dane z pamięci współdzielonej."""
+    # float64 zachowuje wyniki identyczne z obliczeniem szeregowym
+    dataset = df if isinstance(df, SharedDataset) else SharedDataset.create(df, dtype=np.float64)
+    stops = np.cumsum([len(chunk_cols) for chunk_cols in chunks])
+    starts = stops - [len(chunk_cols) for chunk_cols in chunks]
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            return list(pool.map(
+                _run_on_shared_chunk, repeat(func), repeat(dataset.name),
+                starts.tolist(), stops.tolist()
+            ))
+    finally:
+        if dataset is not df:
+            dataset.close()
+            dataset.unlink()
+
+def run_by_station_chunks(func, df: pd.DataFrame, backend='serial', n_workers: int=None,
+                          n_chunks: int=None, axis: int=None) -> pd.DataFrame:
+    """Uruchamia funkcję analizy osobno dla części stacji i scala wyniki.
+    Nadaje się dla funkcji, które liczą każdą stację niezależnie, np.
+    `get_monthly_means_for_stations` i `get_who_norm_exceeding_days`.
+    Arguments:
+        func: funkcja przyjmująca DataFrame (z kolumną ('Data', '')) i zwracająca DataFrame.
+            Dla backendu 'process' musi być zdefiniowana na poziomie modułu.
+        df: DataFrame z danymi PM2.5, gdzie kolumny to (miejscowość, kod stacji),
+            lub `SharedDataset` (procesy podłączają się wtedy do istniejących danych).
+        backend: 'serial', 'thread', 'process' lub gotowy obiekt `concurrent.futures.Executor`.
+            Backend 'process' przekazuje dane procesom przez pamięć współdzieloną.
+        n_workers: liczba wątków lub procesów (domyślnie liczba rdzeni).
+        n_chunks: liczba części stacji (domyślnie równa liczbie wątków lub procesów).
+        axis: oś scalania wyników: 1 - stacje w kolumnach, 0 - stacje w wierszach;
+            domyślnie ustalana na podstawie wyniku.
+    Returns:
+        DataFrame identyczny z wynikiem `func(df)`."""
+    if not isinstance(backend, Executor) and backend not in BACKENDS:
+        raise ValueError(f"Nieznany backend: {backend}. Dostępne: {', '.join(BACKENDS)}.")
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if backend == 'serial':
+        n_chunks = n_chunks or 1
+    frame = df.to_frame() if isinstance(df, SharedDataset) else df
+    chunks = split_station_columns(frame, n_chunks or n_workers)
+    # Każda część dostaje własną kolumnę z datami, więc funkcje mogą ją modyfikować
+    frames = (frame[[('Data', '')] + chunk_cols] for chunk_cols in chunks)
+
+    if backend == 'serial':
+        results = [func(chunk) for chunk in frames]
+    elif isinstance(backend, Executor):
+        results = list(backend.map(func, frames))
+    elif backend == 'thread':
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(func, frames))
+    else:
+        results = _run_in_processes(func, df, chunks, n_workers)
+
+    if axis is None:
+        axis = _merge_axis(results[0], chunks[0])
+    return pd.concat(results, axis=axis)
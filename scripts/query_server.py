@@ -0,0 +1,306 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pandas as pd
+from scripts.data_analysis import (
+    get_chosen_monthly_means,
+    get_monthly_means_for_cities,
+    get_who_norm_exceeding_days,
+    get_max_and_min_k_stations,
+    get_voivodeship_exceeding_days,
+    get_station_rankings,
+)
+
+
+class QueryCache:
+    """Pamięć podręczna LRU dla wyników zapytań, bezpieczna dla wątków.
+
+    Równoczesne zapytania o ten sam klucz czekają na jedno wspólne obliczenie
+    zamiast liczyć wynik niezależnie."""
+
+    def __init__(self, maxsize: int=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Zwraca wynik z pamięci podręcznej lub oblicza go funkcją `compute`.
+        Arguments:
+            key: klucz zapytania (musi być haszowalny).
+            compute: funkcja bez argumentów obliczająca wynik.
+        Returns:
+            Wynik zapytania."""
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self._entries.move_to_end(key)
+                owner = False
+            else:
+                future = Future()
+                self._entries[key] = future
+                owner = True
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)  # usuwamy najdawniej używany wpis
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except Exception as e:
+                future.set_exception(e)
+                with self._lock:  # nie zapamiętujemy błędów
+                    if self._entries.get(key) is future:
+                        del self._entries[key]
+        return future.result()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def _parse_list(params: dict, name: str, cast=str) -> list:
+    """Zwraca listę wartości parametru podanych po przecinku (lub w kilku parametrach)."""
+    values = []
+    for raw in params.get(name, []):
+        values.extend(cast(v.strip()) for v in raw.split(',') if v.strip())
+    return values
+
+def _parse_value(params: dict, name: str, cast, default):
+    """Zwraca pojedynczą wartość parametru lub wartość domyślną."""
+    values = _parse_list(params, name, cast)
+    return values[-1] if values else default
+
+def _frame_to_records(df: pd.DataFrame) -> list:
+    """Zamienia DataFrame na listę słowników gotową do serializacji JSON."""
+    if not isinstance(df.index, pd.RangeIndex):
+        df = df.reset_index()
+    df = df.copy()
+    df.columns = [
+        '/'.join(str(part) for part in col if part != '') if isinstance(col, tuple) else str(col)
+        for col in df.columns
+    ]
+    return json.loads(df.to_json(orient='records', date_format='iso', force_ascii=False))
+
+
+class AnalysisService:
+    """Udostępnia analizy z `data_analysis` na jednym, wczytanym raz zbiorze danych."""
+
+    def __init__(self, df: pd.DataFrame, code_to_voivodeship: dict=None, cache_size: int=128):
+        """Arguments:
+            df: DataFrame z danymi PM2.5, gdzie kolumny to (miejscowość, kod stacji).
+            code_to_voivodeship: słownik mapujący kody stacji na województwa.
+            cache_size: maksymalna liczba zapamiętanych odpowiedzi."""
+        self.df = df
+        self.code_to_voivodeship = code_to_voivodeship or {}
+        self.cache = QueryCache(cache_size)
+        self.endpoints = {
+            '/monthly-means': self.monthly_means,
+            '/city-monthly-means': self.city_monthly_means,
+            '/who-exceeding-days': self.who_exceeding_days,
+            '/max-min-stations': self.max_min_stations,
+            '/voivodeship-exceeding-days': self.voivodeship_exceeding_days,
+            '/station-rankings': self.station_rankings,
+        }
+
+    def _filter_years(self, years: list) -> pd.DataFrame:
+        if not years:
+            return self.df
+        return self.df[self.df[('Data', '')].dt.year.isin(years)]
+
+    def _who_exceeding_days(self, years: tuple) -> pd.DataFrame:
+        # Wynik pośredni trzymamy w tej samej pamięci podręcznej co odpowiedzi
+        return self.cache.get_or_compute(
+            ('who-exceeding-days-frame', years),
+            lambda: get_who_norm_exceeding_days(self._filter_years(list(years)))
+        )
+
+    def monthly_means(self, params: dict) -> list:
+        """Średnie miesięczne dla wybranych miast i lat (`get_chosen_monthly_means`)."""
+        years = _parse_list(params, 'years', int)
+        cities = _parse_list(params, 'cities')
+        if not years or not cities:
+            raise ValueError("Parametry 'years' i 'cities' są wymagane.")
+        return _frame_to_records(get_chosen_monthly_means(self.df, years, cities))
+
+    def city_monthly_means(self, params: dict) -> list:
+        """Średnie miesięczne uśrednione dla miast (`get_monthly_means_for_cities`)."""
+        result = get_monthly_means_for_cities(self._filter_years(_parse_list(params, 'years', int)))
+        cities = _parse_list(params, 'cities')
+        if cities:
+            result = result[['Rok', 'Miesiąc'] + [c for c in cities if c in result.columns]]
+        return _frame_to_records(result)
+
+    def who_exceeding_days(self, params: dict) -> list:
+        """Liczba dni z przekroczeniem normy WHO (`get_who_norm_exceeding_days`)."""
+        years = tuple(sorted(_parse_list(params, 'years', int)))
+        return _frame_to_records(self._who_exceeding_days(years))
+
+    def max_min_stations(self, params: dict) -> list:
+        """Stacje z największą i najmniejszą liczbą przekroczeń (`get_max_and_min_k_stations`)."""
+        year = _parse_value(params, 'year', int, None)
+        if year is None:
+            raise ValueError("Parametr 'year' jest wymagany.")
+        k = _parse_value(params, 'k', int, 3)
+        return _frame_to_records(get_max_and_min_k_stations(self._who_exceeding_days(()), year, k))
+
+    def voivodeship_exceeding_days(self, params: dict) -> list:
+        """Liczba dni przekroczeń w województwach (`get_voivodeship_exceeding_days`)."""
+        threshold = _parse_value(params, 'threshold', float, 15)
+        df = self._filter_years(_parse_list(params, 'years', int))
+        return _frame_to_records(get_voivodeship_exceeding_days(df, self.code_to_voivodeship, threshold))
+
+    def station_rankings(self, params: dict) -> list:
+        """Rankingi stacji dla lat, norm i województw (`get_station_rankings`)."""
+        thresholds = _parse_list(params, 'thresholds', float) or [15]
+        k = _parse_value(params, 'k', int, 3)
+        df = self._filter_years(_parse_list(params, 'years', int))
+        return _frame_to_records(get_station_rankings(df, self.code_to_voivodeship, thresholds, k))
+
+    def query(self, path: str, params: dict) -> tuple[bytes, str]:
+        """Zwraca odpowiedź JSON dla zapytania wraz z jej ETagiem.
+        Arguments:
+            path: ścieżka endpointu.
+            params: parametry zapytania (jak z `urllib.parse.parse_qs`).
+        Returns:
+            Tuple (treść odpowiedzi, ETag).
+        Raises:
+            ValueError: niepoprawne parametry zapytania."""
+        endpoint = self.endpoints[path]
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+
+        def compute():
+            body = json.dumps(endpoint(params), ensure_ascii=False).encode('utf-8')
+            return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        return self.cache.get_or_compute(key, compute)
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/') or '/'
+        if path not in self.server.service.endpoints:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f"Nieznany endpoint: {url.path}"})
+            return
+        try:
+            body, etag = self.server.service.query(path, parse_qs(url.query))
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Błąd serwera: {e}"})
+            return
+
+        if etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class QueryServer(HTTPServer):
+    """Serwer HTTP obsługujący zapytania w puli wątków roboczych.
+
+    Serwer przyjmuje najwyżej `workers` połączeń naraz; kolejne czekają
+    w kolejce systemowej gniazda, aż któryś wątek się zwolni (lub do `shutdown`)."""
+
+    def __init__(self, address: tuple, service: AnalysisService, workers: int=8):
+        super().__init__(address, _QueryHandler)
+        self.service = service
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers)
+        self._closing = threading.Event()
+
+    def process_request(self, request, client_address):
+        # Nie przyjmujemy połączeń ponad liczbę wątków, ale czekamy z przerwami,
+        # żeby `shutdown` mógł zatrzymać serwer, gdy wszystkie wątki są zajęte
+        while not self._slots.acquire(timeout=0.1):
+            if self._closing.is_set():
+                self.shutdown_request(request)
+                return
+        try:
+            self._pool.submit(self._process_request_in_worker, request, client_address)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _process_request_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def shutdown(self):
+        self._closing.set()
+        super().shutdown()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def create_query_server(df: pd.DataFrame, code_to_voivodeship: dict=None, host: str='127.0.0.1',
+                        port: int=8000, cache_size: int=128, workers: int=8) -> QueryServer:
+    """Tworzy serwer HTTP udostępniający analizy PM2.5 jako endpointy JSON.
+    Arguments:
+        df: DataFrame z danymi PM2.5, gdzie kolumny to (miejscowość, kod stacji).
+        code_to_voivodeship: słownik mapujący kody stacji na województwa.
+        host: adres, na którym nasłuchuje serwer.
+        port: port serwera (0 - dowolny wolny port).
+        cache_size: maksymalna liczba zapamiętanych odpowiedzi.
+        workers: liczba wątków obsługujących zapytania.
+    Returns:
+        Serwer gotowy do uruchomienia przez `serve_forever()`."""
+    service = AnalysisService(df, code_to_voivodeship, cache_size)
+    return QueryServer((host, port), service, workers)
+
+
+if __name__ == '__main__':
+    import argparse
+    from scripts.load_data import read_data_from_csv
+
+    parser = argparse.ArgumentParser(description="Serwer zapytań o dane PM2.5.")
+    parser.add_argument('csv_path', help="ścieżka do pliku CSV z przetworzonymi danymi")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--metadata', action='store_true',
+                        help="pobierz metadane stacji GIOŚ (potrzebne do analiz dla województw)")
+    args = parser.parse_args()
+
+    code_to_voivodeship = None
+    if args.metadata:
+        from scripts.load_data import get_metadata, get_code_mappings
+        _, _, code_to_voivodeship = get_code_mappings(get_metadata())
+
+    server = create_query_server(read_data_from_csv(args.csv_path), code_to_voivodeship,
+                                 host=args.host, port=args.port, workers=args.workers)
+    print(f"Serwer działa na http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,192 @@
+import ctypes
+import json
+import multiprocessing
+import os
+import secrets
+import sys
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import pandas as pd
+
+
+_HEADER_SIZE = 8  # długość opisu zbioru (katalogu stacji) w bajtach
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    """Podłącza się do istniejącego segmentu (od Pythona 3.13 bez rejestracji w trackerze)."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+def _untrack_attached_segment(segment: SharedMemory, creator_pid: int):
+    """Wycofuje rejestrację podłączonego segmentu do sprzątania przy wyjściu procesu.
+    Segment usuwa tylko proces, który go utworzył (`SharedDataset.unlink`).
+
+    Przed Pythonem 3.13 `SharedMemory` rejestruje każdy podłączony segment w procesie
+    `resource_tracker`, który usuwa go przy wyjściu. Procesy uruchomione przez
+    `multiprocessing` (fork/spawn) dzielą jednak tracker z rodzicem, więc gdy twórcą
+    zbioru jest bieżący proces albo jego rodzic z `multiprocessing`, rejestracja tylko
+    dubluje istniejący wpis i zostaje. W pozostałych przypadkach (np. osobno uruchomiony
+    skrypt) wyrejestrowujemy ten jeden segment. Procesy głębiej w drzewie `multiprocessing`
+    (wnuki twórcy) również dzielą tracker - wyrejestrowanie usuwa wtedy wpis twórcy,
+    a tracker zgłasza to ostrzeżeniem przy `unlink`."""
+    if sys.version_info >= (3, 13):
+        return
+    parent = multiprocessing.parent_process()
+    if creator_pid == os.getpid() or (parent is not None and parent.pid == creator_pid):
+        return
+    resource_tracker.unregister(segment._name, 'shared_memory')
+
+def _release_segment(state: list):
+    """Zamyka segment, gdy zniknął ostatni widok (wywoływane przez `weakref.finalize`)."""
+    raw, segment = state
+    state.clear()  # zwalniamy tablicę ctypes, a z nią eksport bufora segmentu
+    del raw
+    segment.close()
+
+
+class _SegmentBuffer:
+    """Bufor bajtów segmentu, na którym budowane są wszystkie widoki NumPy.
+
+    Każdy widok trzyma (przez łańcuch `base`) referencję do tego obiektu, więc segment
+    jest zamykany dopiero wtedy, gdy zniknie ostatni widok."""
+
+    def __init__(self, segment: SharedMemory):
+        raw = (ctypes.c_byte * segment.size).from_buffer(segment.buf)
+        self.__array_interface__ = {
+            'shape': (segment.size,),
+            'typestr': '|u1',
+            'data': (ctypes.addressof(raw), False),
+            'version': 3,
+        }
+        self.finalizer = weakref.finalize(self, _release_segment, [raw, segment])
+
+
+def _layout(catalog_size: int, n_times: int) -> tuple[int, int]:
+    """Zwraca przesunięcia osi czasu i macierzy pomiarów w segmencie (wyrównane do 8 bajtów)."""
+    dates_offset = -(-(_HEADER_SIZE + catalog_size) // 8) * 8
+    return dates_offset, dates_offset + 8 * n_times
+
+
+class SharedDataset:
+    """Zbiór danych PM2.5 w pamięci współdzielonej (`multiprocessing.shared_memory`).
+
+    Jeden segment zawiera katalog stacji (miejscowość, kod stacji), oś czasu (datetime64)
+    i macierz pomiarów (czas x stacje). Procesy podłączają się do zbioru po nazwie
+    (`attach`) i dostają widoki NumPy/pandas na te same dane, bez kopiowania.
+
+    Widoki (`values`, `dates`, wynik `to_frame` i ich wycinki) pozostają ważne także po
+    `close`; segment jest odmapowywany w bieżącym procesie, gdy zniknie ostatni z nich."""
+
+    def __init__(self, name: str, segment: SharedMemory, catalog: dict, owner: bool):
+        self.name = name
+        self.owner = owner
+        self._segment = segment
+        self._catalog = catalog
+        self.stations = pd.MultiIndex.from_tuples(
+            [tuple(station) for station in catalog['stations']],
+            names=['Miejscowość', 'Kod stacji']
+        )
+        self._buffer = _SegmentBuffer(segment)
+        self._map_views()
+
+    def _map_views(self):
+        """Tworzy widoki NumPy na segment."""
+        n_times, n_stations = self._catalog['shape']
+        dates_offset, values_offset = _layout(self._catalog['size'], n_times)
+        data = np.asarray(self._buffer)
+        self.dates = data[dates_offset:values_offset].view('datetime64[ns]')
+        self.values = data[values_offset:].view(self._catalog['dtype'])[:n_times * n_stations].reshape(n_times, n_stations)
+
+    @classmethod
+    def create(cls, df: pd.DataFrame, name: str=None, dtype=np.float32) -> 'SharedDataset':
+        """Kopiuje dane do nowego segmentu pamięci współdzielonej.
+        Arguments:
+            df: DataFrame z danymi PM2.5, gdzie kolumny to (miejscowość, kod stacji).
+            name: nazwa zbioru (domyślnie losowa).
+            dtype: typ wartości w macierzy pomiarów.
+        Returns:
+            SharedDataset będący właścicielem segmentu."""
+        name = name or f"pm25_{secrets.token_hex(4)}"
+        station_cols = [col for col in df.columns if col != ('Data', '')]
+        values = df[station_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=dtype)
+        dates = pd.to_datetime(df[('Data', '')], format="mixed").to_numpy(dtype='datetime64[ns]')
+
+        catalog = {
+            'shape': values.shape,
+            'creator_pid': os.getpid(),
+            'dtype': np.dtype(dtype).str,
+            'stations': [list(col) for col in station_cols],
+        }
+        encoded = json.dumps(catalog, ensure_ascii=False).encode('utf-8')
+        catalog['size'] = len(encoded)
+        _, values_offset = _layout(len(encoded), len(dates))
+
+        segment = SharedMemory(name=name, create=True, size=values_offset + values.nbytes)
+        segment.buf[:_HEADER_SIZE] = len(encoded).to_bytes(_HEADER_SIZE, 'little')
+        segment.buf[_HEADER_SIZE:_HEADER_SIZE + len(encoded)] = encoded
+
+        dataset = cls(name, segment, catalog, owner=True)
+        dataset.values[:] = values
+        dataset.dates[:] = dates
+        return dataset
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedDataset':
+        """Podłącza się do zbioru utworzonego przez `create` (np. w innym procesie).
+        Arguments:
+            name: nazwa zbioru.
+        Returns:
+            SharedDataset z widokami na dane współdzielone."""
+        segment = _attach_segment(name)
+        size = int.from_bytes(segment.buf[:_HEADER_SIZE], 'little')
+        catalog = json.loads(bytes(segment.buf[_HEADER_SIZE:_HEADER_SIZE + size]).decode('utf-8'))
+        catalog['size'] = size
+        _untrack_attached_segment(segment, catalog['creator_pid'])
+        return cls(name, segment, catalog, owner=False)
+
+    def to_frame(self, start: int=0, stop: int=None) -> pd.DataFrame:
+        """Zwraca DataFrame w formacie `read_data_from_csv` z widokiem na pomiary stacji.
+        Arguments:
+            start: indeks pierwszej stacji.
+            stop: indeks za ostatnią stacją (domyślnie wszystkie).
+        Returns:
+            DataFrame z kolumną ('Data', '') i kolumnami (miejscowość, kod stacji)."""
+        df = pd.DataFrame(self.values[:, start:stop], columns=self.stations[start:stop], copy=False)
+        df.insert(0, ('Data', ''), self.dates)
+        return df
+
+    def close(self, strict: bool=False):
+        """Zwalnia odwołania zbioru do segmentu w bieżącym procesie (dane pozostają dla innych).
+        Segment jest odmapowywany od razu, jeśli nie ma już widoków na dane, a w przeciwnym
+        razie - gdy zniknie ostatni z nich.
+        Arguments:
+            strict: czy zgłosić błąd, gdy istnieją jeszcze widoki na dane.
+        Raises:
+            BufferError: (tylko gdy `strict`) istnieją jeszcze widoki; zbiór pozostaje otwarty."""
+        if self._buffer is None:
+            return
+        finalizer = self._buffer.finalizer
+        buffer_ref = weakref.ref(self._buffer)
+        self.values = None
+        self.dates = None
+        self._buffer = None
+        if strict and finalizer.alive:
+            self._buffer = buffer_ref()
+            self._map_views()
+            raise BufferError("Nie można zamknąć zbioru: istnieją jeszcze widoki na jego dane.")
+
+    def unlink(self):
+        """Usuwa segment z systemu; wywołuje go tylko właściciel zbioru.
+        Istniejące mapowania pozostają ważne do ich zamknięcia."""
+        self._segment.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if self.owner:
+            self.unlink()
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -61,3 +62,60 @@ def code_to_voivodeship_dict():
         'stacja1': 'Mazowieckie',
         'stacja2': 'Małopolskie',
     }
+
+@pytest.fixture
+def gios_api_server():
+    """Lokalny serwer HTTP udający API GIOŚ; zwraca (adres, słownik odpowiedzi)."""
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    responses = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            sensor_id = self.path.rstrip('/').split('/')[-1]
+            if sensor_id not in responses:
+                self.send_error(404)
+                return
+            body = json.dumps({'Lista danych pomiarowych': responses[sensor_id]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/data/getData/", responses
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def query_server(sample_df, code_to_voivodeship_dict):
+    """Uruchamia serwer zapytań na danych z `sample_df`; zwraca (adres, serwer)."""
+    import threading
+    from scripts.query_server import create_query_server
+
+    server = create_query_server(sample_df, code_to_voivodeship_dict, port=0, workers=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def wide_df():
+    rng = np.random.default_rng(2)
+    dates = pd.date_range('2021-11-01 01:00', '2022-02-28 23:00', freq='h')
+    columns = [(f'Miasto{i % 3}', f'stacja{i}') for i in range(7)]
+    values = rng.uniform(0, 40, size=(len(dates), len(columns)))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    df = pd.DataFrame(values, columns=columns)
+    df.insert(0, ('Data', ''), dates)
+    df.columns = pd.MultiIndex.from_tuples(df.columns, names=["Miejscowość", "Kod stacji"])
+    return df
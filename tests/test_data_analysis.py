@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from scripts.data_analysis import (
     get_monthly_means_for_stations,
@@ -6,6 +7,7 @@ from scripts.data_analysis import (
     get_who_norm_exceeding_days,
     get_max_and_min_k_stations,
     get_voivodeship_exceeding_days,
+    get_station_rankings,
 )
 
 def test_get_monthly_means_for_stations(sample_df):
@@ -66,6 +68,63 @@ def test_get_max_and_min_k_stations():
     result = get_max_and_min_k_stations(df, chosen_year=2022, k=1)
     assert list(result.index) == ['C', 'D']
 
+def test_get_max_and_min_k_stations_ties():
+    df = pd.DataFrame(
+        {2022: [5, 5, 1, 9, 9, 5]},
+        index=['A', 'B', 'C', 'D', 'E', 'F']
+    )
+    for k in (2, 3):
+        result = get_max_and_min_k_stations(df, chosen_year=2022, k=k)
+        expected = df.sort_values(by=2022, kind='stable')
+        assert list(result.index) == list(expected.head(k).index) + list(expected.tail(k).index)
+    assert list(result.index) == ['C', 'A', 'B', 'F', 'D', 'E']
+
+    df = pd.DataFrame({2022: [1.0, np.nan, 3.0, np.nan]}, index=['a', 'b', 'c', 'd'])
+    for k in (1, 2, 3):
+        result = get_max_and_min_k_stations(df, chosen_year=2022, k=k)
+        expected = df.sort_values(by=2022, kind='stable')
+        assert list(result.index) == list(expected.head(k).index) + list(expected.tail(k).index)
+    result = get_max_and_min_k_stations(df.iloc[:3], chosen_year=2022, k=2)
+    assert list(result.index) == ['a', 'c', 'c', 'b']
+
+def test_get_station_rankings_ties_and_no_voivodeships(sample_df):
+    df = sample_df.copy()
+    for col in df.columns[1:]:
+        df[col] = 20  # wszystkie stacje mają tyle samo dni przekroczeń
+    result = get_station_rankings(df, {}, k=1)
+
+    assert set(result['Województwo']) == {'Polska'}
+    assert list(result.loc[result['Ranking'] == 'max', 'Kod stacji']) == ['stacja1']
+    assert list(result.loc[result['Ranking'] == 'max', 'Miejscowość']) == ['Kraków']
+    assert list(result.loc[result['Ranking'] == 'min', 'Miejscowość']) == ['Warszawa']
+
+def test_get_station_rankings():
+    rng = np.random.default_rng(1)
+    dates = pd.date_range('2021-01-01 01:00', '2022-12-31 23:00', freq='h')
+    columns = [('Warszawa', 's1'), ('Warszawa', 's2'), ('Kraków', 's3'), ('Kraków', 's4'), ('Gdańsk', 's5')]
+    df = pd.DataFrame(rng.uniform(0, 35, size=(len(dates), len(columns))), columns=columns)
+    df.insert(0, ('Data', ''), dates)
+    df.columns = pd.MultiIndex.from_tuples(df.columns, names=["Miejscowość", "Kod stacji"])
+    code_to_voivodeship = {'s1': 'Mazowieckie', 's2': 'Mazowieckie', 's3': 'Małopolskie', 's4': 'Małopolskie'}
+
+    result = get_station_rankings(df, code_to_voivodeship, thresholds=[15, 25], k=2)
+
+    yearly_counts = get_who_norm_exceeding_days(df)
+    for year in (2021, 2022):
+        expected = get_max_and_min_k_stations(yearly_counts, year, k=2)
+        ranking = result[(result['Norma'] == 15) & (result['Rok'] == year) & (result['Województwo'] == 'Polska')]
+        lowest = ranking[ranking['Ranking'] == 'min'].sort_values('Pozycja')
+        highest = ranking[ranking['Ranking'] == 'max'].sort_values('Pozycja')
+        assert list(lowest['Kod stacji']) + list(highest['Kod stacji'])[::-1] == [
+            code for _, code in expected.index
+        ]
+        assert list(highest['Liczba dni']) == sorted(expected[year], reverse=True)[:2]
+
+    assert set(result['Województwo']) == {'Polska', 'Mazowieckie', 'Małopolskie', 'Nieznane'}
+    gdansk = result[result['Województwo'] == 'Nieznane']
+    assert set(gdansk['Kod stacji']) == {'s5'}
+    assert len(gdansk) == 2 * 2 * 2  # lata x normy x (max, min), po jednej stacji
+
 def test_get_voivodeship_exceeding_days():
     df = pd.DataFrame({
         ('Data',''): pd.to_datetime(['2022-01-01', '2022-01-02', '2022-01-03']),
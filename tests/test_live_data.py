@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from scripts.data_analysis import get_who_norm_exceeding_days
+from scripts.live_data import (
+    RollingWindowStore,
+    fetch_latest_measurements,
+    poll_latest_measurements,
+)
+
+def _records(dates, values):
+    return [{'Kod stanowiska': 'X-PM2.5-1g', 'Data': d, 'Wartość': v} for d, v in zip(dates, values)]
+
+def test_fetch_latest_measurements(gios_api_server):
+    url, responses = gios_api_server
+    responses['101'] = _records(
+        ['2024-01-02 02:00:00', '2024-01-02 01:00:00', '2024-01-02 03:00:00'],
+        [20.0, 10.0, None]
+    )
+    result = fetch_latest_measurements(101, url)
+
+    assert list(result.index) == [pd.Timestamp('2024-01-02 01:00'), pd.Timestamp('2024-01-02 02:00')]
+    assert list(result) == [10.0, 20.0]
+
+def test_store_daily_means_and_midnight():
+    store = RollingWindowStore(['stacja1'], {'stacja1': 'Warszawa'}, window_days=3)
+    store.append('stacja1', '2024-01-01 01:00', 10)
+    store.append('stacja1', '2024-01-02 00:00', 30)  # północ należy do 1 stycznia
+    store.append('stacja1', '2024-01-02 01:00', 5)
+
+    means = store.get_daily_means()
+    assert means.loc['2024-01-01', ('Warszawa', 'stacja1')] == 20.0
+    assert means.loc['2024-01-02', ('Warszawa', 'stacja1')] == 5.0
+    assert store.get_exceeding_days_in_window()[('Warszawa', 'stacja1')] == 1
+
+def test_store_replaces_repeated_hour():
+    store = RollingWindowStore(['stacja1'], window_days=3)
+    store.append('stacja1', '2024-01-01 01:00', 40)
+    store.append('stacja1', '2024-01-01 01:00', 10)
+
+    assert store.get_daily_means().iloc[0, 0] == 10.0
+    assert store.get_exceeding_days_in_window().iloc[0] == 0
+
+def test_store_skips_missing_values():
+    store = RollingWindowStore(['stacja1'], window_days=3)
+    assert not store.append('stacja1', '2024-01-01 05:00', np.nan)
+    store.extend('stacja1', pd.Series([50.0, None], index=pd.to_datetime(['2024-01-01 06:00', '2024-01-01 07:00'])))
+
+    assert store.get_daily_means().iloc[0, 0] == 50.0
+    assert store.get_exceeding_days_in_window().iloc[0] == 1
+    assert len(store.to_frame()) == 1
+
+def test_empty_store():
+    store = RollingWindowStore(['stacja1'], window_days=3)
+    assert store.to_frame().empty
+    assert store.get_daily_means().empty
+
+def test_store_evicts_old_days():
+    store = RollingWindowStore(['stacja1', 'stacja2'], window_days=2)
+    store.append('stacja1', '2024-01-01 12:00', 50)
+    store.append('stacja2', '2024-01-02 12:00', 50)
+    assert list(store.get_exceeding_days_in_window()) == [1, 1]
+
+    store.append('stacja2', '2024-01-03 12:00', 5)
+    assert list(store.get_exceeding_days_in_window()) == [0, 1]
+    assert not store.append('stacja1', '2024-01-01 13:00', 50)  # poza oknem
+    assert len(store.to_frame()) == 2
+
+def test_store_matches_get_who_norm_exceeding_days():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2023-12-20 01:00', periods=24 * 20, freq='h')
+    values = rng.uniform(0, 30, size=(len(dates), 2))
+    values[rng.random(values.shape) < 0.1] = np.nan
+
+    store = RollingWindowStore(['stacja1', 'stacja2'], window_days=10)
+    for j, code in enumerate(store.stations):
+        store.extend(code, pd.Series(values[:, j], index=dates))
+
+    expected = get_who_norm_exceeding_days(store.to_frame())
+    result = store.get_who_norm_exceeding_days()
+    pd.testing.assert_frame_equal(result, expected, check_names=False, check_dtype=False)
+    assert store.get_exceeding_days_in_window().sum() == expected.values.sum()
+
+def test_poll_latest_measurements(gios_api_server):
+    url, responses = gios_api_server
+    responses['1'] = _records(['2024-01-01 01:00:00', '2024-01-01 02:00:00'], [20.0, 30.0])
+    responses['2'] = _records(['2024-01-01 01:00:00'], [5.0])
+
+    store = RollingWindowStore(['stacja1', 'stacja2', 'stacja3'], window_days=5)
+    poll_latest_measurements(store, {'stacja1': '1', 'stacja2': '2', 'stacja3': '3'},
+                             base_url=url, interval=0, iterations=2)
+
+    means = store.get_daily_means()
+    assert means.iloc[0, 0] == 25.0
+    assert means.iloc[0, 1] == 5.0
+    assert pd.isna(means.iloc[0, 2])  # brak danych (404) dla stacja3
+    assert list(store.get_exceeding_days_in_window()) == [1, 0, 0]
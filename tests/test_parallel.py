@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from scripts.data_analysis import (
+    get_monthly_means_for_stations,
+    get_who_norm_exceeding_days,
+)
+from scripts.parallel import run_by_station_chunks, split_station_columns
+
+def test_split_station_columns(sample_df):
+    chunks = split_station_columns(sample_df, 2)
+    assert chunks == [[('Warszawa', 'stacja1'), ('Warszawa', 'stacja2')], [('Kraków', 'stacja1')]]
+    assert len(split_station_columns(sample_df, 10)) == 3
+
+@pytest.mark.parametrize('backend', ['serial', 'thread', 'process'])
+@pytest.mark.parametrize('func', [get_monthly_means_for_stations, get_who_norm_exceeding_days])
+def test_run_by_station_chunks_matches_serial(wide_df, backend, func):
+    expected = func(wide_df)
+    result = run_by_station_chunks(func, wide_df, backend=backend, n_workers=3, n_chunks=4)
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_run_by_station_chunks_custom_executor(wide_df):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        result = run_by_station_chunks(get_who_norm_exceeding_days, wide_df, backend=pool, n_chunks=3)
+    pd.testing.assert_frame_equal(result, get_who_norm_exceeding_days(wide_df))
+
+def test_run_by_station_chunks_unknown_backend(sample_df):
+    with pytest.raises(ValueError):
+        run_by_station_chunks(get_monthly_means_for_stations, sample_df, backend='gpu')
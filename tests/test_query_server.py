@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+from scripts.query_server import QueryCache
+
+def test_query_cache_lru():
+    cache = QueryCache(maxsize=2)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    cache.get_or_compute('a', lambda: compute(1))
+    cache.get_or_compute('b', lambda: compute(2))
+    assert cache.get_or_compute('a', lambda: compute(3)) == 1  # z pamięci podręcznej
+    cache.get_or_compute('c', lambda: compute(4))  # usuwa 'b'
+    assert cache.get_or_compute('b', lambda: compute(5)) == 5
+    assert calls == [1, 2, 4, 5]
+    assert len(cache) == 2
+
+def test_query_cache_does_not_keep_errors():
+    cache = QueryCache()
+
+    def fail():
+        raise ValueError("błąd")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute('a', fail)
+    assert cache.get_or_compute('a', lambda: 1) == 1
+
+def test_monthly_means_endpoint(query_server):
+    url, _ = query_server
+    response = requests.get(f"{url}/monthly-means", params={'years': '2022', 'cities': 'Warszawa'})
+
+    assert response.status_code == 200
+    records = response.json()
+    assert len(records) == 2
+    assert {r['Miejscowość'] for r in records} == {'Warszawa'}
+    assert records[0]['PM2.5'] == (10 + 20 + 30) / 3
+
+def test_city_monthly_means_endpoint(query_server):
+    url, _ = query_server
+    records = requests.get(f"{url}/city-monthly-means", params={'cities': 'Warszawa'}).json()
+
+    assert set(records[0]) == {'Rok', 'Miesiąc', 'Warszawa'}
+    assert records[0]['Warszawa'] == ((10 + 20) / 2 + 30) / 2
+
+def test_exceeding_days_endpoints(query_server):
+    url, _ = query_server
+    who = requests.get(f"{url}/who-exceeding-days").json()
+    stacja2 = next(r for r in who if r['Miejscowość'] == 'Warszawa' and r['Kod stacji'] == 'stacja2')
+    assert stacja2['2022'] == 4
+
+    ranking = requests.get(f"{url}/max-min-stations", params={'year': 2022, 'k': 1}).json()
+    assert len(ranking) == 2
+    assert ranking[-1]['2022'] == 4
+
+    voiv = requests.get(f"{url}/voivodeship-exceeding-days", params={'threshold': 25}).json()
+    assert {r['Województwo']: r['2022'] for r in voiv} == {'Mazowieckie': 2, 'Małopolskie': 3}
+
+def test_station_rankings_endpoint(query_server):
+    url, _ = query_server
+    records = requests.get(f"{url}/station-rankings", params={'thresholds': '15,25', 'k': 1}).json()
+
+    best = next(r for r in records
+                if r['Norma'] == 15 and r['Województwo'] == 'Polska' and r['Ranking'] == 'max')
+    assert (best['Kod stacji'], best['Liczba dni']) == ('stacja2', 4)
+    assert {r['Norma'] for r in records} == {15, 25}
+
+def test_etag_and_cache(query_server):
+    url, server = query_server
+    params = {'years': '2022', 'cities': 'Warszawa,Kraków'}
+    first = requests.get(f"{url}/monthly-means", params=params)
+    etag = first.headers['ETag']
+
+    second = requests.get(f"{url}/monthly-means", params=params, headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert len(server.service.cache) == 1
+
+def test_bad_requests(query_server):
+    url, _ = query_server
+    assert requests.get(f"{url}/unknown").status_code == 404
+    assert requests.get(f"{url}/monthly-means").status_code == 400
+    assert requests.get(f"{url}/max-min-stations", params={'year': 'abc'}).status_code == 400
+
+def test_internal_error(query_server):
+    url, server = query_server
+
+    def fail(params):
+        raise KeyError('brak kolumny')
+
+    server.service.endpoints['/who-exceeding-days'] = fail
+    response = requests.get(f"{url}/who-exceeding-days")
+    assert response.status_code == 500
+    assert 'error' in response.json()
+
+def test_concurrent_requests(query_server):
+    url, server = query_server
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(
+            lambda _: requests.get(f"{url}/who-exceeding-days"), range(16)
+        ))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.headers['ETag'] for r in responses}) == 1
+
+def test_shutdown_with_all_workers_busy(query_server):
+    url, server = query_server
+    for _ in range(4):  # zajmujemy wszystkie miejsca w puli
+        server._slots.acquire()
+
+    def request():
+        try:
+            requests.get(f"{url}/who-exceeding-days", timeout=5)
+        except requests.RequestException:
+            pass
+
+    client = threading.Thread(target=request)
+    client.start()
+    time.sleep(0.3)  # pętla serwera czeka teraz na wolne miejsce
+    stopper = threading.Thread(target=server.shutdown)
+    stopper.start()
+    stopper.join(timeout=5)
+    assert not stopper.is_alive()
+
+    for _ in range(4):
+        server._slots.release()
+    client.join(timeout=5)
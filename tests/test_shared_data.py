@@ -0,0 +1,102 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.data_analysis import get_who_norm_exceeding_days
+from scripts.parallel import run_by_station_chunks
+from scripts.shared_data import SharedDataset
+
+def _sum_in_worker(name):
+    dataset = SharedDataset.attach(name)
+    try:
+        return float(np.nansum(dataset.values)), dataset.stations.tolist()
+    finally:
+        dataset.close()
+
+def _failing_analysis(df):
+    raise RuntimeError("błąd analizy")
+
+def test_create_and_attach(sample_df):
+    with SharedDataset.create(sample_df) as dataset:
+        assert dataset.values.dtype == np.float32
+        assert dataset.values.shape == (4, 3)
+        assert list(dataset.stations) == [('Warszawa', 'stacja1'), ('Warszawa', 'stacja2'), ('Kraków', 'stacja1')]
+
+        attached = SharedDataset.attach(dataset.name)
+        np.testing.assert_array_equal(attached.values, dataset.values)
+        np.testing.assert_array_equal(attached.dates, sample_df[('Data', '')].to_numpy())
+
+        dataset.values[0, 0] = 99  # zmiana widoczna we wszystkich podłączonych widokach
+        assert attached.values[0, 0] == 99
+        attached.close()
+
+def test_to_frame_is_a_view(sample_df):
+    with SharedDataset.create(sample_df) as dataset:
+        df = dataset.to_frame()
+        assert list(df.columns) == list(sample_df.columns)
+        assert np.shares_memory(df[('Warszawa', 'stacja2')].to_numpy(), dataset.values)
+
+        chunk = dataset.to_frame(1, 3)
+        assert list(chunk.columns)[1:] == [('Warszawa', 'stacja2'), ('Kraków', 'stacja1')]
+        pd.testing.assert_frame_equal(
+            get_who_norm_exceeding_days(df), get_who_norm_exceeding_days(sample_df)
+        )
+
+def test_close_with_live_views(sample_df):
+    dataset = SharedDataset.create(sample_df)
+    df = dataset.to_frame()
+    column = dataset.values[:, 1]
+    finalizer = dataset._buffer.finalizer
+
+    dataset.close()
+    assert finalizer.alive  # segment odmapowany dopiero po ostatnim widoku
+    assert df[('Warszawa', 'stacja2')].sum() == 140
+
+    del df
+    assert column.sum() == 140
+    del column
+    assert not finalizer.alive
+    dataset.unlink()
+
+def test_close_strict(sample_df):
+    dataset = SharedDataset.create(sample_df)
+    df = dataset.to_frame()
+
+    with pytest.raises(BufferError):
+        dataset.close(strict=True)
+    assert dataset.to_frame().shape == sample_df.shape  # zbiór nadal działa
+
+    del df
+    dataset.close(strict=True)
+    dataset.unlink()
+
+def test_context_manager_with_live_view(sample_df):
+    with SharedDataset.create(sample_df) as dataset:
+        attached = SharedDataset.attach(dataset.name)
+        with attached:
+            frame = attached.to_frame()
+            result = get_who_norm_exceeding_days(frame)
+    assert frame.iloc[:, 2].sum() == 140  # widok nadal ważny po wyjściu z bloku
+    assert result.loc[('Warszawa', 'stacja2'), 2022] == 4
+    with pytest.raises(FileNotFoundError):  # właściciel usunął segment
+        SharedDataset.attach(dataset.name)
+
+def test_attach_in_other_process(sample_df):
+    with SharedDataset.create(sample_df) as dataset:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_sum_in_worker, [dataset.name] * 2))
+
+    expected_sum = float(np.nansum(sample_df.drop(columns=[('Data', '')]).to_numpy(dtype=float)))
+    assert all(total == expected_sum for total, _ in results)
+    with pytest.raises(FileNotFoundError):  # właściciel usunął segmenty
+        SharedDataset.attach(dataset.name)
+
+def test_run_by_station_chunks_on_shared_dataset(wide_df):
+    with SharedDataset.create(wide_df) as dataset:
+        expected = get_who_norm_exceeding_days(dataset.to_frame())
+        result = run_by_station_chunks(get_who_norm_exceeding_days, dataset, backend='process', n_workers=2)
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_run_by_station_chunks_propagates_worker_errors(wide_df):
+    with pytest.raises(RuntimeError, match="błąd analizy"):
+        run_by_station_chunks(_failing_analysis, wide_df, backend='process', n_workers=2)